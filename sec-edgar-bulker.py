@@ -10,38 +10,75 @@ Version: 1.0.0
 from __future__ import annotations
 
 import asyncio
-import json
+import atexit
+import bisect
+import csv
+import io
 import logging
+import logging.handlers
+import mmap
+import os
+import queue
 import random
 import re
 import signal
-import uuid
+import time
+import weakref
+from array import array
+from collections import OrderedDict
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from itertools import groupby
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 import argparse
 import aiofiles
 import aiohttp
+import orjson
 from aiohttp import ClientTimeout, BasicAuth
 from yarl import URL
 import pytz
 from tqdm import tqdm
 
 
-# Ignore SIGHUP (hangup signal)
-signal.signal(signal.SIGHUP, signal.SIG_IGN)
-
-class TimeoutException(Exception):
-    """Exception raised when an operation times out."""
-    pass
-
-
-def timeout_handler(signum, frame):
-    raise TimeoutException("API call timed out")
-
-
-# Set the signal handler and a 10-minute alarm
-signal.signal(signal.SIGALRM, timeout_handler)
+# Header keys are upper-case literals in EDGAR's SGML header, so each field
+# is a str.find; only the <TAG> forms of the tag-style keys need a regex.
+_HEADER_LITERALS = tuple(key + ':' for key in (
+    'SEC-DOCUMENT', 'SEC-HEADER', 'ACCEPTANCE-DATETIME', 'PUBLIC DOCUMENT COUNT', 'COMPANY CONFORMED NAME',
+    'FILED AS OF DATE', 'FORM TYPE', 'CONFORMED SUBMISSION TYPE', 'SUBMISSION TYPE',
+    'CONFORMED PERIOD OF REPORT', 'PERIOD OF REPORT', 'STANDARD INDUSTRIAL CLASSIFICATION',
+))
+_RE_HEADER_TAG = re.compile(r'<(SEC-DOCUMENT|SEC-HEADER|ACCEPTANCE-DATETIME)>[ \t]*([^\r\n<]*)', re.IGNORECASE)
+_RE_SIC_VALUE = re.compile(r'(.*?)\s*\[(\d+)\]')
+_RE_ACCESSION = re.compile(r'/(\d{10}-\d{2}-\d{6})')
+# Every per-document tag we extract, matched in a single forward pass.
+_DOC_TAGS = (b'TYPE', b'SEQUENCE', b'FILENAME', b'DESCRIPTION', b'TITLE')
+_RE_DOC_TAG = re.compile(
+    rb'<(' + b'|'.join(_DOC_TAGS) + rb')>\s*([^<\r\n]+)',
+    re.IGNORECASE
+)
+_RE_DOC_TAG_BY_NAME = {
+    tag: re.compile(rb'<' + tag + rb'>\s*([^<\r\n]+)', re.IGNORECASE) for tag in _DOC_TAGS
+}
+# Document tags precede <TEXT>; everything after it is the (possibly huge) body
+_RE_DOC_TEXT = re.compile(rb'<TEXT>')
+_RE_DOC_DESCRIPTION_BLOCK = re.compile(rb'<(?i:DESCRIPTION)>\s*(.*?)\s*(?:</[^>]*>|$)')
+
+# Exhibit rules used by SECDownloader._apply_document_rules
+_RE_NON_10_EXHIBIT = re.compile(r'(?:exhibit|ex)[\s\-_\.]*(\d+)', re.IGNORECASE)
+# Each rule set is one alternation so a document costs a single search per field
+_RE_EX10_DOCTYPE = re.compile(
+    r'(?P<ex_10>(?:exhibit|ex)[\s\-_\.]*10(?:\.\d+)?(?![0-9]))'  # ex-10, ex10.1, etc.
+    r'|(?P<ten_ex>10(?:\.\d+)?[\s\-_\.]*(?:exhibit|ex))'  # 10-ex, 10.1-exhibit, etc.
+    r'|(?P<ten_before_ex>(?:^|\D)10(?:\.\d+)?(?![0-9]).*(?:exhibit|ex))',  # Numbers before exhibit
+    re.IGNORECASE
+)
+_RE_EX10_FILENAME = re.compile(
+    r'(?P<ex_10>ex[\s\-_\.]*10(?:\.\d+)?(?![0-9]))'
+    r'|(?P<ten_ex>10[\s\-_\.]*ex(?:\.\d+)?(?![0-9]))',
+    re.IGNORECASE
+)
 
 
 class ProxyManager:
@@ -50,6 +87,9 @@ class ProxyManager:
         self.proxies = []
         self.load_proxies()
         self.proxy_usage_count = {proxy: 0 for proxy in self.proxies}  # Initialize usage count
+        self._avail_list = list(self.proxy_usage_count)  # Proxies still under the usage limit
+        self._exhausted_list = []  # Proxies that reached the usage limit this round
+        self._proxy_cache = {}  # Parsed (proxy_url, auth) by proxy line
 
     def load_proxies(self):
         """Load proxies from file."""
@@ -68,22 +108,52 @@ class ProxyManager:
         if not self.proxies:
             return None
         
-        # Filter out proxies that have reached the usage limit
-        available_proxies = [proxy for proxy, count in self.proxy_usage_count.items() if count < 10]
-        if not available_proxies:
+        # Every proxy has reached the usage limit, start a new round
+        if not self._avail_list:
+            self._avail_list, self._exhausted_list = self._exhausted_list, []
             self.proxy_usage_count = {proxy: 0 for proxy in self.proxies}
-            available_proxies = self.proxies
         
         # Select and update proxy usage
-        proxy = random.choice(available_proxies)
+        i = random.randrange(len(self._avail_list))
+        proxy = self._avail_list[i]
         self.proxy_usage_count[proxy] += 1
+        if self.proxy_usage_count[proxy] >= 10:
+            # Swap-remove keeps the removal O(1); order is irrelevant for random picks
+            self._avail_list[i] = self._avail_list[-1]
+            self._avail_list.pop()
+            self._exhausted_list.append(proxy)
         
-        # Format proxy settings with full authentication
-        ip, port, username, password = proxy.split(':')
-        full_url = URL(f'http://{username}:{password}@{ip}:{port}')
-        proxy_url = str(f'http://{ip}:{port}')  # URL without auth
-        proxy_auth = BasicAuth.from_url(full_url)
-        return proxy_url, proxy_auth
+        return self._parse_proxy(proxy)
+
+    def _parse_proxy(self, proxy: str) -> tuple[str, Optional[BasicAuth]]:
+        """Return the (proxy_url, auth) pair for a proxy line, parsing it once."""
+        cached = self._proxy_cache.get(proxy)
+        if cached is None:
+            # Format proxy settings with full authentication
+            ip, port, username, password = proxy.split(':')
+            full_url = URL(f'http://{username}:{password}@{ip}:{port}')
+            proxy_url = f'http://{ip}:{port}'  # URL without auth
+            proxy_auth = BasicAuth.from_url(full_url)
+            cached = self._proxy_cache[proxy] = (proxy_url, proxy_auth)
+        return cached
+
+
+_EST = pytz.timezone('US/Eastern')
+
+# Shared by every session; callers must not mutate it.
+_FIXED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
+    'Accept-Encoding': 'gzip, deflate',
+    'Host': 'www.sec.gov'
+}
+
+
+# Document filenames kept as text; str.endswith takes the whole tuple at once
+_TEXT_EXTENSIONS = ('.htm', '.html', '.txt')
+
+# Per-request timeout shared by every proxy session. A dead proxy fails on
+# connect and a stalled one on sock_read, well before the total budget.
+_CLIENT_TIMEOUT = ClientTimeout(total=300, connect=30, sock_read=60)
 
 
 class Header:
@@ -95,12 +165,9 @@ class Header:
         
         Returns:
             Dictionary containing User-Agent and other required headers.
+            The same dictionary is returned on every call; do not mutate it.
         """
-        return {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
-            'Accept-Encoding': 'gzip, deflate',
-            'Host': 'www.sec.gov'
-        }
+        return _FIXED_HEADERS
 
 # Notes for users:
 # The Header class has been updated to use fixed headers.
@@ -108,9 +175,289 @@ class Header:
 # This change enhances reliability by ensuring consistent header usage across requests.
 
 
+def _decode(data: Union[bytes, memoryview]) -> str:
+    """Decode filing bytes as UTF-8, falling back to latin-1 for legacy filings."""
+    try:
+        return str(data, 'utf-8')
+    except UnicodeDecodeError:
+        return str(data, 'latin-1')
+
+
+def _unlink_quietly(path: Path) -> None:
+    """Remove path if it exists; meant to run in an executor."""
+    path.unlink(missing_ok=True)
+
+
+def _is_valid_pdf(path: Path) -> bool:
+    """Check for the %PDF- header and a %%EOF marker in the last 1 KB."""
+    with open(path, 'rb') as f:
+        head = f.read(5)
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 1024))
+        tail = f.read()
+    return head == b'%PDF-' and b'%%EOF' in tail
+
+
+def _append_lines(lines: Dict[Path, List[str]]) -> List[Exception]:
+    """Append each path's lines in one write; return the errors instead of raising."""
+    errors = []
+    for path, chunk in lines.items():
+        try:
+            with open(path, 'a') as f:
+                f.write(''.join(chunk))
+        except Exception as e:
+            errors.append(e)
+    return errors
+
+
+def _extract_after(text: str, tag: str, end_chars: str = '\r\n<') -> str:
+    """Return the value after the first occurrence of a literal header tag.
+
+    The value runs to the first of end_chars. An occurrence preceded by
+    'CONFORMED ' belongs to the longer key (CONFORMED SUBMISSION TYPE
+    contains SUBMISSION TYPE) and is skipped.
+    """
+    i = text.find(tag)
+    while i > 0 and text.endswith('CONFORMED ', 0, i):
+        i = text.find(tag, i + 1)
+    if i < 0:
+        return ''
+    j = i + len(tag)
+    k = len(text)
+    while j < k and text[j] in ' \t':
+        j += 1
+    start = j
+    while j < k and text[j] not in end_chars:
+        j += 1
+    return text[start:j].strip()
+
+
+def _match_text(match: Optional[re.Match]) -> str:
+    """Return the stripped, decoded first group of a bytes match or ''."""
+    return _decode(match.group(1)).strip() if match else ''
+
+
+def _iter_jsonl_lines(path: Path):
+    """Yield the raw lines of a JSONL file from a read-only memory map."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b'')
+
+
+def _accession_key(accession_number: str) -> Optional[int]:
+    """Compact cache key for an accession number, with or without dashes.
+
+    Returns None unless exactly 18 ASCII digits remain, so every key fits
+    the uint64 array behind _AccessionSet.
+    """
+    digits = accession_number.replace('-', '')
+    if len(digits) == 18 and digits.isascii() and digits.isdigit():
+        return int(digits)
+    return None
+
+
+def _load_processed_keys(progress_file: Path) -> Optional[frozenset]:
+    """Read a progress file into its set of "accession/filename" keys, or None if it is missing."""
+    processed_keys = set()
+    try:
+        f = open(progress_file, 'r')
+    except FileNotFoundError:
+        return None
+    with f:
+        for line in f:
+            if line.strip():
+                url = line.strip().split('\t')[1]
+                processed_keys.add('/'.join(url.rsplit('/', 2)[-2:]))
+    return frozenset(processed_keys)
+
+
+@lru_cache(maxsize=4096)
+def _doctype_verdict(doc_type: str) -> Optional[Tuple[bool, str]]:
+    """Apply the doc_type exhibit rules; None means the filename decides."""
+    if 'ex' not in doc_type.lower():
+        return None
+    # Step 1: Block any obvious non-10 exhibit numbers
+    number_match = _RE_NON_10_EXHIBIT.search(doc_type)
+    if number_match and not number_match.group(1).startswith('10'):
+        return False, "Blocked by non-10 number check"
+    # Step 2: Check for standard EX-10 patterns
+    match = '10' in doc_type and _RE_EX10_DOCTYPE.search(doc_type)
+    if match:
+        return True, f"Matched standard pattern {match.lastgroup}"
+    return None
+
+
+class _AccessionSet:
+    """Read-only set of _accession_key() ints stored as a sorted uint64 array.
+
+    Eight bytes per entry instead of a boxed int plus a hash-table slot, so
+    caches with millions of filings stay small; lookups are a C bisect.
+    """
+
+    def __init__(self, keys=()):
+        # keys may be a generator or an array('Q'). sorted() still builds one
+        # list of boxed ints, which is the transient peak; no set is made.
+        ordered = array('Q', sorted(array('Q', keys)))
+        self._keys = array('Q', (key for key, _ in groupby(ordered)))
+
+    def __contains__(self, key: int) -> bool:
+        i = bisect.bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class _UUIDPool:
+    """Hands out random (version 4) UUID strings from one os.urandom slab."""
+
+    def __init__(self):
+        self._buf = b''
+        self._i = 0
+
+    def next(self) -> str:
+        if self._i + 16 > len(self._buf):
+            self._buf = os.urandom(16 * 4096)
+            self._i = 0
+        h = self._buf[self._i:self._i + 16].hex()
+        self._i += 16
+        # Set the version nibble and RFC 4122 variant bits like uuid.uuid4()
+        return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+
+# Pause after a 403: the next attempt goes out through another proxy, so
+# there is nothing to back off from
+_PROXY_ROTATE_DELAY = 0.1
+
+
+def _backoff_delay(attempts: int) -> float:
+    """Full-jitter retry delay: uniform in [0, 0.1s doubling per attempt], capped at 30s.
+
+    The jitter keeps workers that failed together from retrying in lockstep.
+    The exponent is clamped only to keep the power small; 0.1 * 2**9 already
+    exceeds the cap, so the upper bound reaches 30s from attempt 9 on.
+    """
+    return random.uniform(0.0, min(30.0, 0.1 * 2 ** min(attempts, 9)))
+
+
+def _retry_after_seconds(value: Optional[str]) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _warn_if_not_closed(sessions: Dict[str, aiohttp.ClientSession], logger: logging.Logger) -> None:
+    """Finalizer for SECDownloader: only reports sessions left open, never schedules cleanup."""
+    if sessions:
+        logger.warning("SECDownloader collected with %s open session(s); use 'async with'", len(sessions))
+
+
+def _parse_filing_sync(raw_filing: bytes, submission_filename: str) -> Tuple[Dict[str, str], List[Tuple[int, int]]]:
+    """Extract header fields and <DOCUMENT> offsets from a raw filing.
+
+    Pure CPU work with no access to the downloader. Documents are returned
+    as (start, end) offsets into raw_filing so the caller can slice zero-copy
+    memoryviews. Only the header block is decoded; document bodies stay as
+    bytes.
+    """
+    # Scan only the header block (everything before </SEC-HEADER>) once
+    header_start = raw_filing.find(b'<SEC-HEADER>')
+    header_end = raw_filing.find(b'</SEC-HEADER>')
+    if header_end != -1:
+        header_slice = _decode(raw_filing[:header_end])
+    else:
+        first_doc = raw_filing.find(b'<DOCUMENT>')
+        header_slice = _decode(raw_filing[:first_doc] if first_doc != -1 else raw_filing)
+
+    fields = {}
+    for match in _RE_HEADER_TAG.finditer(header_slice):
+        fields.setdefault(match.group(1).upper() + ':', match.group(2).strip())
+    for tag in _HEADER_LITERALS:
+        if tag not in fields:
+            fields[tag] = _extract_after(header_slice, tag)
+
+    if header_start != -1 and header_end != -1:
+        sec_header_complete = _decode(raw_filing[header_start:header_end + len(b'</SEC-HEADER>')])
+    else:
+        sec_header_complete = fields['SEC-HEADER:']
+
+    # Special handling for SIC which has two groups
+    sic_match = _RE_SIC_VALUE.match(fields['STANDARD INDUSTRIAL CLASSIFICATION:'])
+    if sic_match:
+        standard_industrial_classification = sic_match.group(1).strip()
+        classification_number = sic_match.group(2).strip()
+    else:
+        standard_industrial_classification = ''
+        classification_number = ''
+
+    accession_match = _RE_ACCESSION.search(submission_filename)
+    accession_number = accession_match.group(1).replace('-', '') if accession_match else ''
+
+    conformed_submission_type = fields['CONFORMED SUBMISSION TYPE:']
+    conformed_period_of_report = fields['CONFORMED PERIOD OF REPORT:']
+    header_info = {
+        'sec_document': fields['SEC-DOCUMENT:'],
+        'acceptance_datetime': fields['ACCEPTANCE-DATETIME:'],
+        'filing_form_type': fields['FORM TYPE:'],
+        'submission_type': conformed_submission_type or fields['SUBMISSION TYPE:'],
+        'conformed_submission_type': conformed_submission_type,
+        'period_of_report': conformed_period_of_report or fields['PERIOD OF REPORT:'],
+        'conformed_period_of_report': conformed_period_of_report,
+        'standard_industrial_classification': standard_industrial_classification,
+        'classification_number': classification_number,
+        'accession_number': accession_number,
+        'public_document_count': fields['PUBLIC DOCUMENT COUNT:'],
+        'company_name': fields['COMPANY CONFORMED NAME:'],
+        'sec_header': fields['SEC-HEADER:'],
+        'filing_date': fields['FILED AS OF DATE:'],
+        'sec-header-complete': sec_header_complete
+    }
+
+    return header_info, _document_spans(raw_filing)
+
+
+def _document_spans(raw_filing: bytes) -> List[Tuple[int, int]]:
+    """Return (start, end) offsets of each <DOCUMENT> section in raw_filing.
+
+    A section ends at its closing tag, or at the next <DOCUMENT> / end of
+    filing when the closing tag is missing. Plain bytes.find() keeps this a
+    memchr-speed scan; a lazy DOTALL regex is ~40x slower on large filings.
+    """
+    spans = []
+    current_pos = 0
+    while True:
+        doc_start = raw_filing.find(b'<DOCUMENT>', current_pos)
+        if doc_start == -1:
+            break
+
+        next_start = raw_filing.find(b'<DOCUMENT>', doc_start + 10)
+        doc_end = raw_filing.find(b'</DOCUMENT>', doc_start)
+
+        if doc_end != -1 and (next_start == -1 or doc_end < next_start):
+            current_pos = doc_end + 11
+        else:
+            current_pos = next_start if next_start != -1 else len(raw_filing)
+        spans.append((doc_start, current_pos))
+    return spans
+
+
 class SECDownloader:
     def __init__(self):
         self.base_url = "http://www.sec.gov"
+        self.archives_url = f"{self.base_url}/Archives/edgar/data"  # Prefix of every filing/exhibit URL
         self.logger = logging.getLogger(__name__)
         self.proxy_manager = ProxyManager('proxies.txt')
         self.header = Header()
@@ -133,17 +480,34 @@ class SECDownloader:
         self.download_pdfs = True
         self.worker_status = {}  # Track worker status
         self.available_workers = asyncio.Queue()  # Queue of available worker IDs
-        self.sessions = {}  # Store sessions by proxy
-        self.connectors = {}  # Store connectors by proxy
+        self.sessions = OrderedDict()  # Sessions by proxy, least recently used first
+        self.max_sessions = 64  # Older sessions are closed beyond this
+        self._connector = None  # Connection pool shared by every session
+        self._session_lock = asyncio.Lock()  # Guards session creation
+        self._shutdown = asyncio.Event()  # Set by SIGHUP/SIGINT/SIGTERM
+        self._in_flight = set()  # Submission tasks of the idx file being processed
+        self._progress_queue = asyncio.Queue()  # Progress lines waiting to be written
+        self._progress_writer_task = None
+        self._progress_paths = {}  # (batch, global) progress file Paths by idx_file
+        self._part_files = set()  # .part files of interrupted downloads, removed in cleanup()
+        self._results_fps = {}  # Open append handles by results file path
+        self._results_buf = {}  # Encoded result lines waiting to be written, by path
+        self._excl_fp = None  # Open append handle for excluded_exhibits.jsonl
+        self._excl_buf = []  # Encoded exclusions waiting to be written
+        self._uuid_pool = _UUIDPool()  # Record _ids
+        self._ts_cache = {}  # strftime format -> (formatted US/Eastern time, monotonic time)
         self.worker_timeout = 4000  # Worker timeout in seconds
-        self.downloaded_files_cache = {}  # Cache of downloaded files by year
+        self.max_workers = 400  # Submissions processed concurrently
+        self.max_concurrency = 32  # HTTP requests in flight at once
+        self._req_sem = asyncio.Semaphore(self.max_concurrency)
+        self.downloaded_files_cache = {}  # _accession_key()s of downloaded filings by year
 
         # Paths for downloaded links and logs
         self.downloaded_links_file = Path("downloaded_links.jsonl")
-        self.downloaded_links = self._load_downloaded_links()
+        self.downloaded_links = _AccessionSet()  # Loaded once per run in __aenter__
 
         # Initialize worker queue
-        for i in range(400):
+        for i in range(self.max_workers):
             self.available_workers.put_nowait(i)
 
         # Setup batch logging
@@ -161,20 +525,48 @@ class SECDownloader:
         
 
     async def cleanup(self) -> None:
-        """Clean up all sessions and connectors."""
+        """Flush pending progress and close all sessions and the shared connector."""
+        await self._flush_progress()
+        await self._flush_output_files()
+        if self._excl_fp is not None:
+            await self._excl_fp.close()
+            self._excl_fp = None
+        for fp in self._results_fps.values():
+            await fp.close()
+        self._results_fps.clear()
         for session in self.sessions.values():
             if not session.closed:
                 await session.close()
-        for connector in self.connectors.values():
-            if not connector.closed:
-                await connector.close()
         self.sessions.clear()
-        self.connectors.clear()
-
-    def __del__(self) -> None:
-        """Ensure cleanup runs on deletion."""
-        if self.sessions or self.connectors:
-            asyncio.create_task(self.cleanup())
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+        if self._part_files:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(None, _unlink_quietly, part)
+                                   for part in self._part_files))
+            self._part_files.clear()
+        self.logger.removeHandler(self._batch_log_handler)
+        self._batch_log_listener.stop()
+
+    async def __aenter__(self) -> "SECDownloader":
+        self._finalizer = weakref.finalize(self, _warn_if_not_closed, self.sessions, self.logger)
+        # Read downloaded_links.jsonl once, off the event loop; every year and
+        # index file of the run checks the same set
+        loop = asyncio.get_running_loop()
+        self.downloaded_links = await loop.run_in_executor(None, self._load_downloaded_links)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.cleanup()
+
+    def _now_est(self, fmt: str = "%Y-%m-%d_%H:%M:%S_%Z") -> str:
+        """Current US/Eastern time formatted with fmt, recomputed at most once a second."""
+        now = time.monotonic()
+        cached = self._ts_cache.get(fmt)
+        if cached is None or now - cached[1] >= 1.0:
+            cached = self._ts_cache[fmt] = (datetime.now(timezone.utc).astimezone(_EST).strftime(fmt), now)
+        return cached[0]
 
     def setup_batch_logging(self) -> None:
         """Setup logging for this specific batch."""
@@ -188,103 +580,162 @@ class SECDownloader:
         file_handler.setFormatter(
             logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         )
-        self.logger.addHandler(file_handler)
+        # Workers only enqueue records; the file write happens on the listener thread
+        log_queue = queue.SimpleQueue()
+        self._batch_log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self._batch_log_listener.start()
+        self._batch_log_handler = logging.handlers.QueueHandler(log_queue)
+        self.logger.addHandler(self._batch_log_handler)
 
     async def get_starting_point(self, idx_file: str) -> List[Dict[str, str]]:
         """Compare master.idx entries with processed submissions to determine pending submissions."""
         try:
-            # Get processed submissions from progress file
-            processed_urls = set()
+            # Get processed submissions from progress file, keyed by "accession/filename"
             progress_file = self.progress_dir / f"progress_{Path(idx_file).stem}.txt"
-            if progress_file.exists():
-                async with aiofiles.open(progress_file, 'r') as f:
-                    async for line in f:
-                        if line.strip():
-                            processed_urls.add(line.strip().split('\t')[1])
-                self.logger.info(f"Found {len(processed_urls)} processed submissions")
+            # One executor hop for the whole file instead of one per line; the
+            # open doubles as the existence check
+            loop = asyncio.get_running_loop()
+            processed_keys = await loop.run_in_executor(None, _load_processed_keys, progress_file)
+            if processed_keys is not None:
+                self.logger.info("Found %s processed submissions", len(processed_keys))
             else:
                 self.logger.info("No progress file found")
+                processed_keys = frozenset()
 
             # Get all submissions from master.idx
             try:
-                all_submissions = await self.parse_master_idx(idx_file)
-                self.logger.info(f"Found {len(all_submissions)} total submissions")
+                # Read and parse off the event loop; large indexes take a while
+                loop = asyncio.get_running_loop()
+                all_submissions = await loop.run_in_executor(None, self.parse_master_idx, idx_file)
+                self.logger.info("Found %s total submissions", len(all_submissions))
                 
-                # Filter out processed submissions
-                pending_submissions = []
-                for submission in all_submissions:
-                    if submission['accession_number']:  # Only if we have a valid accession number
-                        raw_txt_url = f"{self.base_url}/Archives/edgar/data/{submission['cik']}/{submission['accession_number']}/{Path(submission['submission_filename']).name}"
-                        self.logger.debug(f"Processing {raw_txt_url}")
-                        if raw_txt_url not in processed_urls:
-                            pending_submissions.append(submission)
+                # Filter out processed submissions, and filings the in-memory
+                # downloaded-links caches already cover, before any task is made
+                pending_submissions = [
+                    submission for submission in all_submissions
+                    if submission['accession_number']  # Only if we have a valid accession number
+                    and f"{submission['accession_number']}/{submission['submission_basename']}" not in processed_keys
+                    and not self._already_downloaded(submission['accession_number'])
+                ]
                 
-                self.logger.info(f"Found {len(pending_submissions)} pending submissions")
+                self.logger.info("Found %s pending submissions", len(pending_submissions))
                 return pending_submissions
                 
             except Exception as e:
-                self.logger.error(f"No pending submissions in {idx_file}, skipping to next file. Error {e}.")
+                self.logger.error("No pending submissions in %s, skipping to next file. Error %s.", idx_file, e)
                 return []
 
         except Exception as e:
-            self.logger.error(f"Error processing {idx_file}: {str(e)}")
+            self.logger.error("Error processing %s: %s", idx_file, e)
             return []
     
     async def save_progress(self, idx_file: str, last_processed: str):
-        """Save progress to the progress file with timestamp."""
+        """Queue a progress line; the background writer appends it to disk."""
         try:
             # Get current time in EST
-            est_ = pytz.timezone('US/Eastern')
-            timestamp_collection = datetime.now(timezone.utc).astimezone(est_).strftime("%Y-%m-%d %H:%M:%S %Z")
-
-            # Save to batch-specific progress file - always use .txt extension
-            batch_progress = self.output_dir / f"progress_{Path(idx_file).stem}.txt"
-            async with aiofiles.open(batch_progress, 'a') as f:
-                await f.write(f"{timestamp_collection}\t{last_processed}\n")
-                await f.flush()
-            
-            # Save to global progress file - always use .txt extension
-            global_progress = self.progress_dir / f"progress_{Path(idx_file).stem}.txt"
-            async with aiofiles.open(global_progress, 'a') as f:
-                await f.write(f"{timestamp_collection}\t{last_processed}\n")
-                await f.flush()
-                
-            # Save to master progress file
-            master_progress = self.progress_dir / "master_progress.txt"
-            async with aiofiles.open(master_progress, 'a') as f:
-                await f.write(f"{timestamp_collection}\t{idx_file}\t{last_processed}\t{self.batch_id}\n")
-                await f.flush()
-                
+            timestamp_collection = self._now_est("%Y-%m-%d %H:%M:%S %Z")
+
+            if self._progress_writer_task is None:
+                self._progress_writer_task = asyncio.create_task(self._drain_progress())
+            await self._progress_queue.put((str(idx_file), last_processed, timestamp_collection))
+
         except Exception as e:
-            self.logger.error(f"Error saving progress: {e}")
-            
-    async def parse_master_idx(self, idx_file: str) -> List[Dict[str, str]]:
-        """Parse master.idx content into list of submissions."""
+            self.logger.error("Error saving progress: %s", e)
+
+    async def _drain_progress(self) -> None:
+        """Append queued progress lines in batches, one write per file per batch."""
+        while True:
+            batch = [await self._progress_queue.get()]
+            if batch[0] is not None:
+                # Let concurrent workers queue more lines before touching disk
+                await asyncio.sleep(1)
+            while not self._progress_queue.empty():
+                batch.append(self._progress_queue.get_nowait())
+
+            lines: Dict[Path, List[str]] = {}
+            for item in batch:
+                if item is None:
+                    continue
+                idx_file, last_processed, timestamp_collection = item
+                paths = self._progress_paths.get(idx_file)
+                if paths is None:
+                    stem = Path(idx_file).stem
+                    paths = self._progress_paths[idx_file] = (
+                        self.output_dir / f"progress_{stem}.txt",
+                        self.progress_dir / f"progress_{stem}.txt",
+                    )
+                line = f"{timestamp_collection}\t{last_processed}\n"
+                # Batch-specific, global and master progress files - always use .txt extension
+                lines.setdefault(paths[0], []).append(line)
+                lines.setdefault(paths[1], []).append(line)
+                lines.setdefault(self.progress_dir / "master_progress.txt", []).append(
+                    f"{timestamp_collection}\t{idx_file}\t{last_processed}\t{self.batch_id}\n"
+                )
+
+            # Results must reach the OS before progress marks their filings done
+            await self._flush_output_files()
+
+            # All files in one executor hop instead of open/write/close hops per file
+            errors = await asyncio.get_running_loop().run_in_executor(None, _append_lines, lines)
+            for e in errors:
+                self.logger.error("Error saving progress: %s", e)
+
+            if None in batch:
+                return
+
+    async def _flush_output_files(self) -> None:
+        """Write buffered results and exclusions, one write per file, and flush."""
+        await self._flush_exclusions()
+        pending, self._results_buf = self._results_buf, {}
+        try:
+            for results_file, lines in pending.items():
+                fp = await self._get_results_fp(results_file)
+                await fp.write(b''.join(lines))
+                await fp.flush()
+            if self._excl_fp is not None:
+                await self._excl_fp.flush()
+        except Exception as e:
+            self.logger.error("Error flushing output files: %s", e)
+
+    async def _flush_progress(self) -> None:
+        """Write out any queued progress lines and stop the background writer."""
+        if self._progress_writer_task is not None:
+            await self._progress_queue.put(None)
+            await self._progress_writer_task
+            self._progress_writer_task = None
+
+    def parse_master_idx(self, idx_file: str) -> List[Dict[str, str]]:
+        """Parse master.idx content into list of submissions. Blocking; run it in an executor."""
         try:
-            async with aiofiles.open(idx_file, mode='r') as f:
-                idx_content = await f.read()
-                
             submissions = []
-            lines = idx_content.split('\n')
-            
+            master_file = Path(idx_file)
+            master_stem = master_file.stem
+
+            idx_content = master_file.read_text()
+
             # Find the header line and start processing after the dashes
-            start_idx = next((i for i, line in enumerate(lines) if 'CIK|Company Name|Form Type|Date Filed|Filename' in line), 0) +2
-            if not start_idx:
-                self.logger.error(f"Could not find header in {idx_file}")
+            header_pos = idx_content.find('CIK|Company Name|Form Type|Date Filed|Filename')
+            if header_pos == -1:
+                self.logger.error("Could not find header in %s", idx_file)
                 return []
-                
-            
-            for line in lines[start_idx:]:
-                if not line.strip():
-                    continue
-                    
+            header_end = idx_content.find('\n', header_pos)
+            separator_end = idx_content.find('\n', header_end + 1) if header_end != -1 else -1
+            if separator_end == -1:
+                self.logger.debug("Found 0 submissions in %s", idx_file)
+                return []
+
+            # csv splits each row in C; QUOTE_NONE keeps '"' in company names literal
+            reader = csv.reader(
+                io.StringIO(idx_content[separator_end + 1:]),
+                delimiter='|',
+                quoting=csv.QUOTE_NONE
+            )
+            for parts in reader:
                 try:
-                    parts = line.strip().split('|')
                     if len(parts) == 5:
                         submission_filename = parts[4].strip()
-                        accession_match = re.search(r'/(\d{10}-\d{2}-\d{6})', submission_filename)
+                        accession_match = _RE_ACCESSION.search(submission_filename)
                         accession_number = accession_match.group(1).replace('-', '') if accession_match else None
-                    
 
                         submissions.append({
                             'cik': parts[0].strip(),
@@ -292,130 +743,167 @@ class SECDownloader:
                             'form_type': parts[2].strip(),
                             'date_filed': parts[3].strip(),
                             'submission_filename': submission_filename,
+                            'submission_basename': submission_filename.rsplit('/', 1)[-1],
                             'accession_number': accession_number,
-                            'master_file': Path(idx_file)
+                            'master_file': master_file,
+                            'master_stem': master_stem
                             })
-                    
-                    else:
-                        self.logger.error(f"Invalid line in {idx_file}: {line}")
-                        continue
+
+                    elif any(part.strip() for part in parts):
+                        self.logger.error("Invalid line in %s: %s", idx_file, '|'.join(parts))
 
                 except Exception as e:
-                    self.logger.error(f"Error parsing line in {idx_file}: {str(e)}")
+                    self.logger.error("Error parsing line in %s: %s", idx_file, e)
                     continue
-                    
-            self.logger.debug(f"Found {len(submissions)} submissions in {idx_file}")
+
+            self.logger.debug("Found %s submissions in %s", len(submissions), idx_file)
             return submissions
 
         except Exception as e:
-            self.logger.error(f"Error reading/parsing master.idx file {idx_file}: {str(e)}.")
+            self.logger.error("Error reading/parsing master.idx file %s: %s.", idx_file, e)
             return []
 
     
     async def process_submissions(self):
         """Process all master.idx files in files_to_process list with improved worker handling."""
-        self.logger.debug(f"Starting batch {self.batch_id}")
-        
+        self.logger.debug("Starting batch %s", self.batch_id)
+
+        loop = asyncio.get_running_loop()
+        handled_signals = []
+        for sig in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._request_shutdown, sig)
+                handled_signals.append(sig)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform/loop; keep default behaviour
+                pass
+
         try:
             
             for idx_file in self.files_to_process:
-                self.logger.debug(f"\n{'='*50}\nProcessing {idx_file}\n{'='*50}")
+                if self._shutdown.is_set():
+                    break
+                self.logger.debug("\n%s\nProcessing %s\n%s", '='*50, idx_file, '='*50)
                 
                 start_from = await self.get_starting_point(idx_file)
                 if not start_from:
-                    self.logger.info(f"No pending submissions in {idx_file}, skipping to next file")
+                    self.logger.info("No pending submissions in %s, skipping to next file", idx_file)
                     continue  # Skip to next file in self.files_to_process
-                self.logger.info(f"Resuming from {start_from[0]}")
+                self.logger.info("Resuming from %s", start_from[0])
                 try:
                     valid_submissions = start_from
                     total_submissions = len(valid_submissions)
                     
-                    self.logger.info(f"\nProcessing {total_submissions:,} submissions")
+                    self.logger.info("\nProcessing %s submissions", format(total_submissions, ','))
                     
-                    pbar = tqdm(total=total_submissions, initial=0, desc=f"Processing {idx_file}")
-
-                    async def worker(queue):
-                        while True:
-                            try:
-                                item = await queue.get()
-                                if item is None:
-                                    break
-                                
-                                _, submission = item
-                                try:
-                                    await self._process_submission(submission)
-                                    self.logger.debug(f"Submission {submission['submission_filename']} completed.")
-                                    pbar.update(1)
-                                except Exception as e:
-                                    self.logger.error(f"Error processing submission {submission['submission_filename']}: {str(e)}")
-                                finally:
-                                    queue.task_done()
-                            except Exception as e:
-                                self.logger.error(f"Worker error: {str(e)}")
-                                continue
-
-                    queue = asyncio.Queue()
-                    workers = [asyncio.create_task(worker(queue)) for _ in range(400)]
+                    # Redraw on a timer only; smoothing=0 skips the per-update rate EMA
+                    pbar = tqdm(total=total_submissions, initial=0, desc=f"Processing {idx_file}",
+                                mininterval=0.5, smoothing=0)
 
-                    # Feed all submissions to queue first
-                    for i, submission in enumerate(valid_submissions):
-                        await queue.put((i, submission))
+                    semaphore = asyncio.Semaphore(self.max_workers)
+                    in_flight = self._in_flight = set()  # A second signal cancels these
 
-                    # Add sentinel values to signal workers to exit
-                    for _ in range(400):
-                        await queue.put(None)
-                    
-                    # Wait for all workers to complete
-                    await asyncio.gather(*workers)
+                    async def bounded(submission):
+                        try:
+                            if self._shutdown.is_set():
+                                return
+                            await self._process_submission(submission)
+                            self.logger.debug("Submission %s completed.", submission['submission_filename'])
+                            pbar.update(1)
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            self.logger.error("Error processing submission %s: %s", submission['submission_filename'], e)
+                        finally:
+                            semaphore.release()
+
+                    # Feed submissions lazily so at most max_workers tasks exist at once
+                    for submission in valid_submissions:
+                        await semaphore.acquire()
+                        if self._shutdown.is_set():
+                            semaphore.release()
+                            break
+                        task = asyncio.create_task(bounded(submission))
+                        in_flight.add(task)
+                        task.add_done_callback(in_flight.discard)
+
+                    # Wait for the remaining in-flight submissions; cancelled ones
+                    # come back as exceptions instead of aborting the wait
+                    await asyncio.gather(*in_flight, return_exceptions=True)
                     pbar.close()
-                    self.logger.info(f"Finished processing file {idx_file}.")
+                    self.logger.info("Finished processing file %s.", idx_file)
                     
                 except Exception as e:
-                    self.logger.error(f"Error processing batch in {idx_file}: {str(e)}.")
+                    self.logger.error("Error processing batch in %s: %s.", idx_file, e)
                     continue
                     
         except Exception as e:
-            self.logger.error(f"Error in process_filings: {str(e)}.")
+            self.logger.error("Error in process_filings: %s.", e)
             raise
         finally:
-            # Clean up all sessions and connectors
-            for session in self.sessions.values():
-                if not session.closed:
-                    await session.close()
-            for connector in self.connectors.values():
-                if not connector.closed:
-                    await connector.close()
-            self.sessions.clear()
-            self.connectors.clear()
-    
-                        
+            for sig in handled_signals:
+                loop.remove_signal_handler(sig)
+
+    def _request_shutdown(self, sig: signal.Signals) -> None:
+        """Stop feeding new submissions; on a second signal, cancel the in-flight ones.
+
+        After the second signal the default handlers are restored, so a third
+        one stops the process the usual way.
+        """
+        if not self._shutdown.is_set():
+            self.logger.warning("Received %s, finishing in-flight submissions before shutdown "
+                                "(send again to cancel them)", sig.name)
+            self._shutdown.set()
+            return
+
+        self.logger.warning("Received %s again, cancelling %s in-flight submissions", sig.name, len(self._in_flight))
+        loop = asyncio.get_running_loop()
+        for handled in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(handled)
+        for task in self._in_flight:
+            task.cancel()
+
+    def _already_downloaded(self, accession_number: str) -> bool:
+        """Check the downloaded-links and per-year caches for an accession number."""
+        key = _accession_key(accession_number)
+        if key is None:
+            return False
+        if key in self.downloaded_links:
+            return True
+        return any(key in cached for cached in self.downloaded_files_cache.values())
+
     async def _process_submission(self, submission: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
         """Process a single submission asynchronously."""
         try:
             # Extract accession number from filename
-            accession_match = re.search(r'/(\d{10}-\d{2}-\d{6})', submission['submission_filename'])
-            if not accession_match:
-                self.logger.debug(f"Could not extract accession number from {submission['submission_filename']}")
+            # Normalized once in parse_master_idx
+            accession_number = submission.get('accession_number')
+            if not accession_number:
+                self.logger.debug("Could not extract accession number from %s", submission['submission_filename'])
                 return []
-                
-            accession_number = accession_match.group(1).replace('-', '')
+
+            # Skip filings we already have before issuing any request
+            if self._already_downloaded(accession_number):
+                self.logger.debug("Skipping already downloaded filing %s", accession_number)
+                return None
             
             # Get the raw text URL using accession number
-            raw_txt_url = f"{self.base_url}/Archives/edgar/data/{submission['cik']}/{accession_number}/{Path(submission['submission_filename']).name}"
-            submission = {**submission, 'url': raw_txt_url}
+            raw_txt_url = f"{self.archives_url}/{submission['cik']}/{accession_number}/{submission['submission_basename']}"
+            # Each submission dict is processed once, so annotate it in place
+            submission['url'] = raw_txt_url
             # Get raw content with timeout
             try:
-                self.logger.debug(f"Processing {raw_txt_url}")
-                filing_raw_content_ = await asyncio.wait_for(
-                    self._make_request(raw_txt_url),
+                self.logger.debug("Processing %s", raw_txt_url)
+                # Keep the filing as bytes; only the header and kept documents get decoded
+                filing_raw_content = await asyncio.wait_for(
+                    self._make_request(raw_txt_url, is_binary=True),
                     timeout=1200
                 )
-                filing_raw_content = str(filing_raw_content_)
                 if not filing_raw_content:
-                    self.logger.error(f"Failed to get raw content from {raw_txt_url}")
+                    self.logger.error("Failed to get raw content from %s", raw_txt_url)
                     return None
             except asyncio.TimeoutError:
-                self.logger.error(f"Timeout getting raw content from {raw_txt_url}")
+                self.logger.error("Timeout getting raw content from %s", raw_txt_url)
                 return None
             
             # Process exhibits with timeout
@@ -425,23 +913,23 @@ class SECDownloader:
                         self._parse_filings(filing_raw_content, submission),
                         timeout=2200
                     )
-                    self.logger.debug(f"Parsed documents for {raw_txt_url}")
+                    self.logger.debug("Parsed documents for %s", raw_txt_url)
                     if parsed_documents is None:
-                        self.logger.debug(f"No parsed documents for {raw_txt_url}")
+                        self.logger.debug("No parsed documents for %s", raw_txt_url)
                         return None
                     await self.save_progress(submission['master_file'], raw_txt_url)
                     return parsed_documents
                 except asyncio.TimeoutError:
                     if attempt == 2:
-                        self.logger.error(f"Timeout processing parsed documents for {raw_txt_url}")
+                        self.logger.error("Timeout processing parsed documents for %s", raw_txt_url)
                         return None
                     await asyncio.sleep(1)
 
         except Exception as e:
-            self.logger.error(f"Error processing submission: {str(e)}")
+            self.logger.error("Error processing submission: %s", e)
             return None
 
-    async def _parse_filings(self, raw_filing: str, submission: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+    async def _parse_filings(self, raw_filing: bytes, submission: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
         """Parse a filing and its documents from raw content."""
         try:
             if not raw_filing:
@@ -461,387 +949,337 @@ class SECDownloader:
             }
             self.logger.debug("Error C.")
             
-            # Try original format first, then fallback to SEC-HEADER format
-            sec_document = re.search(r'<(?i:SEC-DOCUMENT)>\s*(.*?)\s*(?:</[^>]*>|$)', raw_filing)
-            if not sec_document:
-                sec_document = re.search(r'SEC-DOCUMENT:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-                if not sec_document:
-                    sec_document = re.search(r'<SEC-DOCUMENT>\s*(.*?)\s*(?:$|\n)', raw_filing)
-
-            acceptance_datetime = re.search(r'<(?i:ACCEPTANCE-DATETIME)>\s*(.*?)\s*(?:</[^>]*>|$)', raw_filing)
-            if not acceptance_datetime:
-                acceptance_datetime = re.search(r'ACCEPTANCE-DATETIME:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-                if not acceptance_datetime:
-                    acceptance_datetime = re.search(r'ACCEPTANCE-DATETIME[:>\s]*(.*?)\s*(?:$|\n)', raw_filing)
-
-            public_document_count = re.search(r'<(?i:PUBLIC-DOCUMENT-COUNT)>\s*(.*?)\s*(?:</[^>]*>|$)', raw_filing)
-            if not public_document_count:
-                public_document_count = re.search(r'PUBLIC DOCUMENT COUNT:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-                if not public_document_count:
-                    public_document_count = re.search(r'PUBLIC DOCUMENT COUNT:\s*(.*?)\s*(?:$|\n)', raw_filing)
-
-            company_name = re.search(r'<(?i:COMPANY-NAME)>\s*(.*?)\s*(?:</[^>]*>|$)', raw_filing)
-            if not company_name:
-                company_name = re.search(r'COMPANY CONFORMED NAME:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-
-            sec_header = re.search(r'<(?i:SEC-HEADER)>\s*(.*?)\s*(?:</[^>]*>|$)', raw_filing)
-            if not sec_header:
-                sec_header = re.search(r'SEC-HEADER:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-                if not sec_header:
-                    sec_header = re.search(r'SEC-HEADER\s*(.*?)\s*(?:$|\n)', raw_filing)
-
-            filing_date = re.search(r'<(?i:DATE)>\s*(.*?)\s*(?:</[^>]*>|$)', raw_filing)
-            if not filing_date:
-                filing_date = re.search(r'FILED AS OF DATE:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-
-            filing_form_type = re.search(r'FORM TYPE:\s*(.*?)\s*(?:$|\n)', raw_filing, re.IGNORECASE)
-            if not filing_form_type:
-                filing_form_type = re.search(r'FORM TYPE:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-
-            submission_type = re.search(r'SUBMISSION TYPE:\s*(.*?)\s*(?:$|\n)', raw_filing, re.IGNORECASE)
-            if not submission_type:
-                submission_type = re.search(r'CONFORMED SUBMISSION TYPE:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-
-            conformed_submission_type = re.search(r'CONFORMED SUBMISSION TYPE:\s*(.*?)\s*(?:$|\n)', raw_filing, re.IGNORECASE)
-            if not conformed_submission_type:
-                conformed_submission_type = re.search(r'CONFORMED SUBMISSION TYPE:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-
-            period_of_report = re.search(r'PERIOD OF REPORT:\s*(.*?)\s*(?:$|\n)', raw_filing, re.IGNORECASE)
-            if not period_of_report:
-                period_of_report = re.search(r'CONFORMED PERIOD OF REPORT:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-
-            conformed_period_of_report = re.search(r'CONFORMED PERIOD OF REPORT:\s*(.*?)\s*(?:$|\n)', raw_filing, re.IGNORECASE)
-            if not conformed_period_of_report:
-                conformed_period_of_report = re.search(r'CONFORMED PERIOD OF REPORT:\s*(.*?)(?:\s*$|\n)', raw_filing, re.IGNORECASE)
-            sec_header_complete = ''          # Initialize with empty string
-            try:
-                header_start = raw_filing.find('<SEC-HEADER>')
-                header_end = raw_filing.find('</SEC-HEADER>')
-                if header_start != -1 and header_end != -1:
-                    sec_header_complete = str(raw_filing[header_start:header_end + len('</SEC-HEADER>')])
-                else:
-                    header_match = re.search(r'SEC-HEADER:\s*(.*?)\s*(?:$|\n)', raw_filing, re.IGNORECASE)
-                    if header_match:
-                        sec_header_complete = header_match.group(1).strip()
-            except Exception as e:
-                self.logger.debug(f"Error extracting SEC header: {e}")
-
-            # Special handling for SIC which has two groups
-            sic_match = re.search(r'STANDARD INDUSTRIAL CLASSIFICATION:\s*(.*?)\s*\[(\d+)\]', raw_filing, re.IGNORECASE)
-            if sic_match and len(sic_match.groups()) >= 2:
-                standard_industrial_classification = sic_match.group(1).strip()
-                classification_number = sic_match.group(2).strip()
-            else:
-                standard_industrial_classification = ''
-                classification_number = ''
-
-            # Get accession number
-            accession_match = re.search(r'/(\d{10}-\d{2}-\d{6})', submission['submission_filename'])
-            if accession_match:
-                accession_number = accession_match.group(1).replace('-', '')
-            else:
-                accession_number = ''
-                self.logger.warning(f"Could not extract accession number from {submission['submission_filename']}")
-
+            # Parsing runs in the default thread pool: it keeps the event loop
+            # free for downloads, and unlike a process pool nothing is pickled
+            loop = asyncio.get_running_loop()
+            header_info, document_spans = await loop.run_in_executor(
+                None, _parse_filing_sync, raw_filing, submission['submission_filename']
+            )
+            accession_number = header_info['accession_number']
+            if not accession_number:
+                self.logger.warning("Could not extract accession number from %s", submission['submission_filename'])
             self.logger.debug("Error E.")
-            # Process each regex match properly
-            sec_document = sec_document.group(1).strip() if sec_document else ''
-            acceptance_datetime = acceptance_datetime.group(1).strip() if acceptance_datetime else ''
-            filing_form_type = filing_form_type.group(1).strip() if filing_form_type else ''
-            submission_type = submission_type.group(1).strip() if submission_type else ''
-            conformed_submission_type = conformed_submission_type.group(1).strip() if conformed_submission_type else ''
-            period_of_report = period_of_report.group(1).strip() if period_of_report else ''
-            conformed_period_of_report = conformed_period_of_report.group(1).strip() if conformed_period_of_report else ''
-            public_document_count = public_document_count.group(1).strip() if public_document_count else ''
-            company_name = company_name.group(1).strip() if company_name else ''
-            sec_header = sec_header.group(1).strip() if sec_header else ''
-            filing_date = filing_date.group(1).strip() if filing_date else ''
-            
-            header_info = {
-                'sec_document': sec_document,
-                'acceptance_datetime': acceptance_datetime,
-                'filing_form_type': filing_form_type,
-                'submission_type': submission_type,
-                'conformed_submission_type': conformed_submission_type,
-                'period_of_report': period_of_report,
-                'conformed_period_of_report': conformed_period_of_report,
-                'standard_industrial_classification': standard_industrial_classification.strip() if standard_industrial_classification else '',
-                'classification_number': classification_number.strip() if classification_number else '',
-                'accession_number': accession_number,
-                'public_document_count': public_document_count,
-                'company_name': company_name,
-                'sec_header': sec_header,
-                'filing_date': filing_date,
-                'sec-header-complete': sec_header_complete
-            }
-            
+
             # Split into documents
-                    # Split into documents
             try:
-                documents = []
-                current_pos = 0
-                
-                # Extract SEC header first
-                header_start = raw_filing.find('<SEC-HEADER>')
-                header_end = raw_filing.find('</SEC-HEADER>')
-                if header_start != -1 and header_end != -1:
-                    submission['sec-header-complete'] = raw_filing[header_start:header_end + len('</SEC-HEADER>')]
-                
-                doc_count = 0  # Add counter
-                self.logger.debug("Starting to split documents...")
-                
-                while True:
-                    doc_start = raw_filing.find('<DOCUMENT>', current_pos)
-                    if doc_start == -1:
-                        break
-                        
-                    next_start = raw_filing.find('<DOCUMENT>', doc_start + 10)
-                    doc_end = raw_filing.find('</DOCUMENT>', doc_start)
-                    
-                    if doc_end != -1 and (next_start == -1 or doc_end < next_start):
-                        documents.append(raw_filing[doc_start:doc_end + 11])
-                        current_pos = doc_end + 11
-                    else:
-                        end_pos = next_start if next_start != -1 else len(raw_filing)
-                        documents.append(raw_filing[doc_start:end_pos])
-                        current_pos = end_pos
-                    
-                    doc_count += 1  # Increment counter
-                    self.logger.debug(f"Found document {doc_count} at position {doc_start}")
-
-                self.logger.debug(f"Total documents found: {len(documents)}")
+                # Zero-copy views into the filing; only kept documents are ever decoded
+                filing_view = memoryview(raw_filing)
+                documents = [filing_view[start:end] for start, end in document_spans]
+                self.logger.debug("Total documents found: %s", len(documents))
+                # Tag extraction for every document in one trip to the thread pool
+                documents_metadata = await loop.run_in_executor(
+                    None, lambda: [self._parse_documents(raw_doc, submission) for raw_doc in documents]
+                )
 
                 results = []
-                excluded = []
-                clean_filename = str(submission.get('master_file'))
-                filename_stem = str(Path(clean_filename).stem)
+                filename_stem = submission['master_stem']
                 results_file = self.results_dir / f'results_{filename_stem}.jsonl'
 
-                est_ = pytz.timezone('US/Eastern')
-                timestamp_collection = datetime.now(timezone.utc).astimezone(est_).strftime("%Y-%m-%d_%H:%M:%S_%Z")
+                timestamp_collection = self._now_est()
 
-                for raw_doc in documents:
-                    try:
-                        document_metadata = await self._parse_documents(raw_doc, submission)
-                        if not document_metadata:
-                            continue
-                            
-                        complete_doc = {
-                            'submission': submission_info,
-                            'header': header_info,
-                            'document_from_text': raw_doc,
-                            'document_metadata': document_metadata
-                        }
-                        type_for_path = str(complete_doc['document_metadata']['document_type'])
-                        doc_for_path = str(complete_doc['document_metadata']['document_filename'])
-
-                        allowed_extensions = ('.htm', '.html', '.txt')  
-                        if not any(doc_for_path.endswith(ext) for ext in allowed_extensions):
-                            if doc_for_path.endswith('.pdf'):
-                                # Handle PDFs - download and save to exhibits_download
-                                doc_url = f"{self.base_url}/Archives/edgar/data/{submission['cik']}/{accession_number}/{doc_for_path}"
-                                pdf_content = await self._get_exhibit(doc_url, doc_for_path)
-                                if pdf_content:
-                                    pdf_path = self.exhibits_dir / doc_for_path
-                                    async with aiofiles.open(pdf_path, 'wb') as f:
-                                        await f.write(pdf_content)
-                            else:
-                                self.logger.debug(f"Skipping non-text file: {doc_for_path}")
-                            continue
+                doc_semaphore = asyncio.Semaphore(16)
+                archive_prefix = f"{self.archives_url}/{submission['cik']}/{accession_number}/"
 
-                        should_download = await self._apply_document_rules(type_for_path, doc_for_path)
-
-                        if should_download:
-                            doc_url = f"{self.base_url}/Archives/edgar/data/{submission['cik']}/{accession_number}/{doc_for_path}"
-                            raw_document_content = await self._get_exhibit(
-                                doc_url,
-                                document_filename=str(complete_doc['document_metadata']['document_filename'])
-                            )
-                            complete_doc.update({
-                                '_id': str(uuid.uuid4()),
-                                'timestamp_collection': timestamp_collection,
-                                'doc_url': doc_url,
-                                'raw_document_content': raw_document_content
-                            })
-                            results.append(complete_doc)
-
-                            async with aiofiles.open(results_file, 'a') as f:
-                                await f.write(json.dumps(complete_doc) + '\n')
-                                await f.flush()
+                async def handle_document(
+                    raw_doc: memoryview, document_metadata: Optional[Dict[str, Any]]
+                ) -> Optional[Tuple[str, Dict[str, Any]]]:
+                    """Return ('keep', complete_doc), ('drop', exclusion) or None."""
+                    try:
+                        async with doc_semaphore:
+                            if not document_metadata:
+                                return None
+                                
+                            complete_doc = {
+                                'submission': submission_info,
+                                'header': header_info,
+                                'document_from_text': raw_doc,
+                                'document_metadata': document_metadata
+                            }
+                            type_for_path = str(document_metadata['document_type'])
+                            doc_for_path = str(document_metadata['document_filename'])
+
+                            if not doc_for_path.endswith(_TEXT_EXTENSIONS):
+                                if doc_for_path.endswith('.pdf'):
+                                    # Handle PDFs - _get_exhibit streams them into exhibits_dir
+                                    await self._get_exhibit(archive_prefix + doc_for_path, doc_for_path)
+                                else:
+                                    self.logger.debug("Skipping non-text file: %s", doc_for_path)
+                                return None
 
-                        else:
-                            excluded.append({
-                                '_id': str(uuid.uuid4()),
+                            should_download = self._apply_document_rules(type_for_path, doc_for_path)
+
+                            if should_download:
+                                doc_url = archive_prefix + doc_for_path
+                                raw_document_content = await self._get_exhibit(
+                                    doc_url,
+                                    document_filename=doc_for_path
+                                )
+                                complete_doc.update({
+                                    'document_from_text': await loop.run_in_executor(None, _decode, raw_doc),
+                                    '_id': self._uuid_pool.next(),
+                                    'timestamp_collection': timestamp_collection,
+                                    'doc_url': doc_url,
+                                    'raw_document_content': raw_document_content
+                                })
+                                return 'keep', complete_doc
+
+                            return 'drop', {
+                                '_id': self._uuid_pool.next(),
                                 'timestamp_collection': timestamp_collection,
-                                'submission_url': submission.get('url'),
-                                'master_file': str(submission.get('master_file')),
-                                'document_type': complete_doc.get('document_metadata', {}).get('document_type'),
+                                'submission_url': submission_info['submission_url'],
+                                'master_file': submission_info['master_file'],
+                                'document_type': document_metadata.get('document_type'),
                                 'submission_filename': filename_stem,
-                                'document_filename': complete_doc.get('document_metadata', {}).get('document_filename'),
-                            })
-                            await self._save_exclusions(excluded)
+                                'document_filename': document_metadata.get('document_filename'),
+                            }
 
                     except Exception as e:
-                        self.logger.error(f"Error extracting metadata (first): {str(e)}")
-                        return results
+                        # Single guard for the rules and exhibit fetch of one document
+                        self.logger.error("Error processing document in %s: %s", submission['submission_filename'], e)
+                        return None
+
+                # Exhibit downloads for one filing run concurrently, 16 at a time
+                outcomes = await asyncio.gather(*(
+                    handle_document(raw_doc, document_metadata)
+                    for raw_doc, document_metadata in zip(documents, documents_metadata)
+                ))
+
+                excluded = []
+                for outcome in outcomes:
+                    if outcome is None:
+                        continue
+                    kind, entry = outcome
+                    if kind == 'keep':
+                        results.append(entry)
+                        # Written out in one batch by the progress writer
+                        self._results_buf.setdefault(results_file, []).append(
+                            orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+                        )
+                    else:
+                        excluded.append(entry)
+                if excluded:
+                    await self._save_exclusions(excluded)
 
                 return results
 
             except Exception as e:
-                self.logger.error(f"Error splitting documents: {str(e)}")
+                self.logger.error("Error splitting documents: %s", e)
                 return []
 
         except Exception as e:
-            self.logger.error(f"Error extracting metadata (second): {str(e)}")
+            self.logger.error("Error extracting metadata (second): %s", e)
             return []
 
     async def _get_exhibit(self, url: str, document_filename: str | None) -> Optional[str]:
-        """Process an exhibit and return its content."""
+        """Process an exhibit and return its content.
+
+        PDFs are streamed straight to exhibits_dir and None is returned.
+        """
         try:
-            self.logger.debug(f"Checking file: {document_filename}")
+            self.logger.debug("Checking file: %s", document_filename)
             # Determine if the file is a PDF
             is_pdf = document_filename.endswith('.pdf') if document_filename else False
+            if is_pdf and not self.download_pdfs:
+                self.logger.debug("Skipping PDF download (download_pdfs=False): %s", document_filename)
+                return None
+            pdf_path = self.exhibits_dir / f"{self.batch_id}_{document_filename}" if is_pdf else None
             
             for attempt in range(3):
                 try:
-                    content = await self._make_request(url, is_binary=is_pdf)
+                    content = await self._make_request(url, is_binary=is_pdf, dest=pdf_path)
                     if not content:
                         if attempt == 2:
                             return None
                         continue
                     
-                    if is_pdf and isinstance(content, bytes):
-                        if not self.download_pdfs:
-                            self.logger.debug(f"Skipping PDF download (download_pdfs=False): {document_filename}")
-                            return None
-                        
-                        # Verify PDF content
-                        try:
-                            import io
-                            from PyPDF2 import PdfReader
-                            pdf = PdfReader(io.BytesIO(content))
-                            if len(pdf.pages) == 0:
-                                self.logger.error(f"Invalid PDF content for {document_filename}")
-                                return None
-                        except Exception as e:
-                            self.logger.error(f"Error validating PDF content for {document_filename}: {str(e)}")
-                            return None
-
-                        # Save PDF to exhibits directory
-                        pdf_path = self.exhibits_dir / f"{self.batch_id}_{document_filename}"
-                        async with aiofiles.open(pdf_path, 'wb') as f:
-                            await f.write(content)
-                            await f.flush()
+                    if is_pdf:
+                        # Cheap structural check instead of parsing the whole document
+                        loop = asyncio.get_running_loop()
+                        if not await loop.run_in_executor(None, _is_valid_pdf, pdf_path):
+                            self.logger.error("Invalid PDF content for %s", document_filename)
+                            await asyncio.get_running_loop().run_in_executor(None, _unlink_quietly, pdf_path)
                         # Return None since we don't keep binary content in memory
                         return None
                     else:
                         return str(content)
             
                 except Exception as e:
-                    self.logger.error(f"Error processing exhibit {url}: {str(e)}")
+                    self.logger.error("Error processing exhibit %s: %s", url, e)
                     return None
         except Exception as e:
-            self.logger.error(f"Error processing exhibit {url}: {str(e)}")
+            self.logger.error("Error processing exhibit %s: %s", url, e)
             return None
 
-    async def _parse_documents(self, doc_content: str, submission: Dict[str, str]) -> Optional[Dict[str, Any]]:
-        """Extract metadata and content from a single document section."""
-        try:
-            if not doc_content:
-                return None
-            
-            doc_type = re.search(r'<TYPE>\s*([^<\r\n]+)', doc_content, re.IGNORECASE)
-            doc_type = doc_type.group(1).strip() if doc_type else ''
-            sequence = re.search(r'<SEQUENCE>\s*([^<\r\n]+)', doc_content, re.IGNORECASE)
-            sequence = sequence.group(1).strip() if sequence else ''
-            document_filename = re.search(r'<FILENAME>\s*([^<\r\n]+)', doc_content, re.IGNORECASE)
-            document_filename = document_filename.group(1).strip() if document_filename else ''
-            description = re.search(r'<DESCRIPTION>\s*([^<\r\n]+)', doc_content, re.IGNORECASE)
-            if not description:
-                description = re.search(r'<(?i:DESCRIPTION)>\s*(.*?)\s*(?:</[^>]*>|$)', doc_content)
-            elif not description:
-                description = re.search(r'DESCRIPTION[:>\s]*(.*?)(?:\s*$|\n)', doc_content, re.IGNORECASE)
-            description = description.group(1).strip() if description else ''
-            title = re.search(r'<TITLE>\s*([^<\r\n]+)', doc_content, re.IGNORECASE)
-            title = title.group(1).strip() if title else ''
-            document_metadata = {
-                'document_type': doc_type,
-                'sequence': sequence,
-                'document_filename': document_filename,
-                'description': description,
-                'title': title,
-            }
-            
-            return document_metadata
-                
-        except Exception as e:
-            self.logger.error(f"Error extracting document metadata: {str(e)}")
+    def _parse_documents(self, doc_content: Union[bytes, memoryview], submission: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Extract metadata from a single raw (bytes) document section."""
+        if not doc_content:
             return None
+        
+        # First occurrence of each tag wins. One alternation pass over the
+        # short tag header before <TEXT>; the body is only searched, one
+        # targeted pattern each, for tags the header did not have.
+        text_match = _RE_DOC_TEXT.search(doc_content)
+        header_end = text_match.start() if text_match else len(doc_content)
+        fields = {}
+        for match in _RE_DOC_TAG.finditer(doc_content, 0, header_end):
+            fields.setdefault(match.group(1).upper(), match.group(2))
+            if len(fields) == len(_DOC_TAGS):
+                break
+        if len(fields) < len(_DOC_TAGS) and text_match:
+            for tag in _DOC_TAGS:
+                if tag not in fields:
+                    match = _RE_DOC_TAG_BY_NAME[tag].search(doc_content, header_end)
+                    if match:
+                        fields[tag] = match.group(1)
+
+        if b'DESCRIPTION' in fields:
+            description = _decode(fields[b'DESCRIPTION']).strip()
+        else:
+            description = _match_text(_RE_DOC_DESCRIPTION_BLOCK.search(doc_content))
+        document_metadata = {
+            'document_type': _decode(fields.get(b'TYPE', b'')).strip(),
+            'sequence': _decode(fields.get(b'SEQUENCE', b'')).strip(),
+            'document_filename': _decode(fields.get(b'FILENAME', b'')).strip(),
+            'description': description,
+            'title': _decode(fields.get(b'TITLE', b'')).strip(),
+        }
+        
+        return document_metadata
 
-    async def _apply_document_rules(self, doc_type: str, document_filename: str) -> bool:
+    def _apply_document_rules(self, doc_type: str, document_filename: str) -> bool:
         """
         Check if a document should be downloaded based on its type and filename.
         Returns True if the document should be downloaded.
         """
-        try:
-            doc_type_lower = doc_type.lower()
-            filename_lower = document_filename.lower()
-
-            # Step 1: Block any obvious non-10 exhibit numbers
-            non_10_pattern = r'(?:exhibit|ex)[\s\-_\.]*(\d+)'
-            number_match = re.search(non_10_pattern, doc_type_lower)
-            if number_match:
-                num_str = number_match.group(1)
-                if not num_str.startswith('10'):
-                    self.logger.debug(f"Blocked by non-10 number check: {doc_type}")
-                    return False
-
-            # Step 2: Check for standard EX-10 patterns
-            standard_patterns = [
-                r'(?:exhibit|ex)[\s\-_\.]*10(?:\.\d+)?(?![0-9])',  # ex-10, ex10.1, etc.
-                r'10(?:\.\d+)?[\s\-_\.]*(?:exhibit|ex)',  # 10-ex, 10.1-exhibit, etc.
-                r'(?:^|\D)10(?:\.\d+)?(?![0-9]).*(?:exhibit|ex)',  # Numbers before exhibit
-            ]
-
-            for pattern in standard_patterns:
-                if re.search(pattern, doc_type_lower):
-                    self.logger.debug(f"Matched standard pattern in doc_type: {doc_type}")
-                    self.stats['ex10_matches'] += 1
-                    return True
-
-            # Step 3: Check filename as backup
-            filename_patterns = [
-                r'ex[\s\-_\.]*10(?:\.\d+)?(?![0-9])',
-                r'10[\s\-_\.]*ex(?:\.\d+)?(?![0-9])'
-            ]
-
-            for pattern in filename_patterns:
-                if re.search(pattern, filename_lower):
-                    self.logger.debug(f"Matched filename pattern: {document_filename}")
-                    self.stats['ex10_matches'] += 1
-                    return True
-
+        # Every rule needs a literal '10' and an 'ex'; most documents have neither
+        filename_has_10 = '10' in document_filename
+        if '10' not in doc_type and not filename_has_10:
             return False
 
-        except Exception as e:
-            self.logger.error(f"Error in _apply_document_rules: {str(e)}")
-            return False
+        # Steps 1-2 depend only on doc_type, which repeats across filings
+        verdict = _doctype_verdict(doc_type)
+        if verdict is not None:
+            should_download, reason = verdict
+            self.logger.debug("%s in doc_type: %s", reason, doc_type)
+            if should_download:
+                self.stats['ex10_matches'] += 1
+            return should_download
+
+        # Step 3: Check filename as backup
+        match = filename_has_10 and _RE_EX10_FILENAME.search(document_filename)
+        if match:
+            self.logger.debug("Matched filename pattern %s: %s", match.lastgroup, document_filename)
+            self.stats['ex10_matches'] += 1
+            return True
+
+        return False
+
+    async def _get_results_fp(self, results_file: Path):
+        """Return the append handle for a results file, opening it on first use."""
+        fp = self._results_fps.get(results_file)
+        if fp is None:
+            fp = await aiofiles.open(results_file, 'ab')
+            existing = self._results_fps.setdefault(results_file, fp)
+            if existing is not fp:
+                # Another task opened it while we were waiting
+                await fp.close()
+                fp = existing
+        return fp
 
     async def _save_exclusions(self, excluded_docs: List[Dict[str, Any]]):
-        """Save excluded documents to a separate JSONL file"""
+        """Buffer newly excluded documents, writing them out 64 at a time."""
+        self._excl_buf.extend(
+            orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in excluded_docs
+        )
+        if len(self._excl_buf) >= 64:
+            await self._flush_exclusions()
+
+    async def _flush_exclusions(self):
+        """Append buffered exclusions to excluded_exhibits.jsonl in one write."""
+        if not self._excl_buf:
+            return
+        lines, self._excl_buf = self._excl_buf, []
         try:
-            async with aiofiles.open('excluded_exhibits.jsonl', 'a') as f:
-                for doc in excluded_docs:
-                    await f.write(json.dumps(doc) + '\n')
+            if self._excl_fp is None:
+                fp = await aiofiles.open('excluded_exhibits.jsonl', 'ab')
+                if self._excl_fp is None:
+                    self._excl_fp = fp
+                else:
+                    await fp.close()
+            await self._excl_fp.write(b''.join(lines))
         except Exception as e:
-            self.logger.error(f"Error saving exclusions: {e}")
+            self.logger.error("Error saving exclusions: %s", e)
+
 
+    async def _get_session(self, proxy_url: str, proxy_auth: Optional[BasicAuth]) -> aiohttp.ClientSession:
+        """Return the session for a proxy, creating it on first use.
 
-    async def _make_request(self, url: str, max_retries: int = 400, is_binary: bool = False) -> Optional[Union[str, bytes]]:
+        Sessions share one connector, so evicting or closing a session does
+        not throw away pooled connections. At most max_sessions are kept.
+        """
+        session = self.sessions.get(proxy_url)
+        if session is not None and not session.closed:
+            self.sessions.move_to_end(proxy_url)
+            return session
+
+        evicted = []
+        async with self._session_lock:
+            # Another worker may have created the session while we waited
+            session = self.sessions.get(proxy_url)
+            if session is None or session.closed:
+                if self._connector is None:
+                    self._connector = aiohttp.TCPConnector(
+                        ssl=False,
+                        limit=0,
+                        limit_per_host=50,  # Pool keys include the proxy, so this is per proxy
+                        ttl_dns_cache=300,
+                        keepalive_timeout=75,
+                        enable_cleanup_closed=True
+                    )
+                session = aiohttp.ClientSession(
+                    headers=self.header.get_fixed_headers(),
+                    connector=self._connector,
+                    connector_owner=False,
+                    timeout=_CLIENT_TIMEOUT,
+                    proxy=proxy_url,
+                    proxy_auth=proxy_auth
+                )
+                self.sessions[proxy_url] = session
+                self.logger.debug("Creating new session with proxy %s", proxy_url)
+                while len(self.sessions) > self.max_sessions:
+                    evicted.append(self.sessions.popitem(last=False)[1])
+            self.sessions.move_to_end(proxy_url)
+
+        for old_session in evicted:
+            await old_session.close()
+        return session
+
+    async def _drop_session(self, proxy_url: str) -> None:
+        """Close and forget the session for a proxy; pooled connections stay."""
+        session = self.sessions.pop(proxy_url, None)
+        if session is not None:
+            await session.close()
+
+    async def _make_request(self, url: str, max_retries: int = 400, is_binary: bool = False,
+                            dest: Optional[Path] = None, max_wait: float = 1200.0) -> Optional[Union[str, bytes, Path]]:
+        """Fetch url through a rotating proxy, retrying with backoff.
+
+        Gives up after max_retries attempts or once max_wait seconds have
+        passed, whichever comes first. With dest set, the body is streamed
+        to that file and dest is returned.
+        """
         attempts = 0
         last_error = None
+        retry_delay = 0.0  # Set by a failed response; slept without holding _req_sem
+        deadline = time.monotonic() + max_wait
                   
         while attempts < max_retries:
+            if time.monotonic() + retry_delay >= deadline:
+                last_error = f"{last_error}; gave up after {max_wait:.0f}s"
+                break
+            if retry_delay:
+                await asyncio.sleep(retry_delay)
+                retry_delay = 0.0
             try:
                 proxy_result = self.proxy_manager.get_random_proxy()
                 if not proxy_result:
@@ -850,144 +1288,183 @@ class SECDownloader:
                 
                 proxy_url, proxy_auth = proxy_result
                 proxy_key = proxy_url  # Use full proxy URL as key
-                self.logger.debug(f"Using proxy {proxy_url} and {proxy_auth}")
+                self.logger.debug("Using proxy %s and %s", proxy_url, proxy_auth)
                 try:
-                    if proxy_key not in self.sessions or self.sessions[proxy_key].closed:
-                        headers = self.header.get_fixed_headers()
-                        connector = aiohttp.TCPConnector(ssl=False, force_close=False, limit_per_host=100)
-                        self.sessions[proxy_key] = aiohttp.ClientSession(
-                            headers=headers,
-                            connector=connector,
-                            proxy=proxy_url,
-                            proxy_auth=proxy_auth
-                        )
-                        self.logger.debug(f"Creating new session with proxy {proxy_url}")
-                    
-                    session = self.sessions[proxy_key]
-                    
-                    async with session.get(url, proxy=proxy_url, proxy_auth=proxy_auth, timeout=ClientTimeout(total=300)) as response:
-                        if response.status == 200:
-                            self.logger.debug(f"Got 200 for {url} with proxy {proxy_url}")
-                            if is_binary:
-                                return await response.read()
-                            return await response.text()
+                    async with self._req_sem:
+                        # Look the session up only once a slot is free: LRU eviction closes
+                        # sessions, so one fetched before waiting could be closed under us
+                        session = await self._get_session(proxy_url, proxy_auth)
+                        # Proxy, proxy auth and headers are all session defaults
+                        async with session.get(url) as response:
+                            if response.status == 200:
+                                self.logger.debug("Got 200 for %s with proxy %s", url, proxy_url)
+                                if response.content_length == 0:
+                                    # Nothing to read or stream; callers treat this like an empty body
+                                    self.logger.warning("Empty response body for %s", url)
+                                    return None
+                                if dest is not None:
+                                    # Stream next to dest and rename, so dest is never a partial body.
+                                    # The part name is unique: filings in one batch can share an
+                                    # exhibit filename and so the same dest.
+                                    part = dest.with_name(f"{dest.name}.{self._uuid_pool.next()}.part")
+                                    self._part_files.add(part)
+                                    loop = asyncio.get_running_loop()
+                                    try:
+                                        async with aiofiles.open(part, 'wb') as f:
+                                            # Coalesce 64 KiB reads into ~1 MiB writes: one executor hop each
+                                            pending = bytearray()
+                                            async for chunk in response.content.iter_chunked(64 * 1024):
+                                                pending += chunk
+                                                if len(pending) >= 1024 * 1024:
+                                                    await f.write(pending)
+                                                    pending = bytearray()
+                                            if pending:
+                                                await f.write(pending)
+                                        await loop.run_in_executor(None, os.replace, part, dest)
+                                    except BaseException:
+                                        # A failed attempt removes its own part file; _part_files
+                                        # only keeps it for cleanup() if this unlink is cancelled too
+                                        await loop.run_in_executor(None, _unlink_quietly, part)
+                                        self._part_files.discard(part)
+                                        raise
+                                    self._part_files.discard(part)
+                                    return dest
+                                body = await response.read()
+                                if is_binary:
+                                    return body
+                                # One decode pass; a strict text() failure would burn a retry
+                                return _decode(body)
                          
-                        elif response.status == 403:
-                            # Close and remove this session
-                            await session.close()
-                            self.sessions.pop(proxy_key, None)
-                            attempts += 1
-                            self.logger.warning(f"Got 403 on {url} with proxy {proxy_key} (attempt {attempts}/{max_retries})")
-                            await asyncio.sleep(0.1)
-                            continue
+                            elif response.status == 403:
+                                # Close and remove this session
+                                await self._drop_session(proxy_key)
+                                attempts += 1
+                                self.logger.warning("Got 403 on %s with proxy %s (attempt %s/%s)", url, proxy_key, attempts, max_retries)
+                                last_error = "HTTP 403"
+                                retry_delay = _PROXY_ROTATE_DELAY
+                                continue
                         
-                        elif response.status == 404:
-                            self.logger.warning(f"File not found (404) at {url}")
-                            return None
+                            elif response.status == 404:
+                                self.logger.warning("File not found (404) at %s", url)
+                                return None
 
-                        elif response.status == 407:
-                            await session.close()
-                            self.sessions.pop(proxy_key, None)
-                            self.logger.warning(f"Authentication issue (407) at {url} and {proxy_key}")
-                            return None
+                            elif response.status == 407:
+                                await self._drop_session(proxy_key)
+                                self.logger.warning("Authentication issue (407) at %s and %s", url, proxy_key)
+                                return None
                         
-                        elif response.status == 429:
-                            await session.close()
-                            self.sessions.pop(proxy_key, None)
-                            attempts += 1
-                            self.logger.warning(f"Got 429 (Too Many Requests) on {url} with proxy {proxy_key} (attempt {attempts}/{max_retries})")
-                            await asyncio.sleep(1)
-                            continue
+                            elif response.status == 429:
+                                await self._drop_session(proxy_key)
+                                attempts += 1
+                                self.logger.warning("Got 429 (Too Many Requests) on %s with proxy %s (attempt %s/%s)", url, proxy_key, attempts, max_retries)
+                                last_error = "HTTP 429"
+                                # Honor Retry-After, but cap it since the next attempt uses another proxy
+                                retry_after = min(60.0, _retry_after_seconds(response.headers.get('Retry-After')))
+                                retry_delay = max(1.0, _backoff_delay(attempts), retry_after)
+                                continue
                         
-                        else:
-                            await session.close()
-                            self.sessions.pop(proxy_key, None)
-                            attempts += 1
-                            self.logger.error(f"Got unexpected status {response.status} for {url} with proxy {proxy_key} (attempt {attempts}/{max_retries})")
-                            last_error = f"HTTP {response.status}"
-                            continue
+                            else:
+                                await self._drop_session(proxy_key)
+                                attempts += 1
+                                self.logger.error("Got unexpected status %s for %s with proxy %s (attempt %s/%s)", response.status, url, proxy_key, attempts, max_retries)
+                                last_error = f"HTTP {response.status}"
+                                # 503s usually carry Retry-After; honor it with the same cap as 429
+                                retry_after = min(60.0, _retry_after_seconds(response.headers.get('Retry-After')))
+                                retry_delay = max(_backoff_delay(attempts), retry_after)
+                                continue
 
                 except Exception as e:
-                    if proxy_key in self.sessions:
-                        await self.sessions[proxy_key].close()
-                    if proxy_key in self.connectors:
-                        await self.connectors[proxy_key].close()
-                    self.logger.error(f"Got unexpected error {e} for {url} with proxy {proxy_key} (attempt {attempts}/{max_retries})")
+                    await self._drop_session(proxy_key)
+                    self.logger.error("Got unexpected error %s for %s with proxy %s (attempt %s/%s)", e, url, proxy_key, attempts, max_retries)
                     attempts += 1
                     last_error = str(e)
-                    await asyncio.sleep(0.1)
+                    retry_delay = _backoff_delay(attempts)
             
+            # Every failure sets retry_delay rather than sleeping here, so the
+            # deadline check at the top of the loop covers all of them
             except asyncio.TimeoutError:
                 attempts += 1
-                self.logger.error(f"Timeout error with proxy (attempt {attempts}/{max_retries})")
+                self.logger.error("Timeout error with proxy (attempt %s/%s)", attempts, max_retries)
                 last_error = "Timeout"
-                await asyncio.sleep(0.1)
+                retry_delay = _backoff_delay(attempts)
             
             except aiohttp.ClientError:
                 attempts += 1
-                self.logger.error(f"Network error (attempt {attempts}/{max_retries})")
+                self.logger.error("Network error (attempt %s/%s)", attempts, max_retries)
                 last_error = "Network error."
-                await asyncio.sleep(0.1)
+                retry_delay = _backoff_delay(attempts)
             
             except Exception as e:
                 attempts += 1
-                self.logger.error(f"Unexpected error (attempt {attempts}/{max_retries}): {str(e)}")
+                self.logger.error("Unexpected error (attempt %s/%s): %s", attempts, max_retries, e)
                 last_error = str(e)
-                await asyncio.sleep(0.1)
+                retry_delay = _backoff_delay(attempts)
         
-        self.logger.error(f"Failed to fetch {url} after {max_retries} attempts. Last error: {last_error}")
+        self.logger.error("Failed to fetch %s after %s attempts. Last error: %s", url, attempts, last_error)
         return None
 
-    def _load_downloaded_links(self) -> dict:
-        """Load downloaded links from JSONL file."""
-        downloaded_links = {}
+    def _load_downloaded_links(self) -> _AccessionSet:
+        """Load _accession_key()s of already downloaded filings from JSONL file."""
+        downloaded_links = array('Q')  # Duplicates are dropped by _AccessionSet
         try:
             if self.downloaded_links_file.exists():
-                with open(self.downloaded_links_file, 'r') as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-                            if isinstance(entry, dict) and 'document_url' in entry:
-                                downloaded_links[entry['document_url']] = entry
-                        except (json.JSONDecodeError, KeyError) as e:
-                            self.logger.error(f"Error parsing line in downloaded_links.jsonl: {e}")
+                for line in _iter_jsonl_lines(self.downloaded_links_file):
+                    try:
+                        entry = orjson.loads(line)
+                        if not isinstance(entry, dict):
                             continue
+                        url = entry.get('document_url') or entry.get('url')
+                        if url:
+                            # .../Archives/edgar/data/{cik}/{accession}/{filename}
+                            key = _accession_key(url.rsplit('/', 2)[-2])
+                            if key is not None:
+                                downloaded_links.append(key)
+                    except (orjson.JSONDecodeError, KeyError, OverflowError, ValueError) as e:
+                        self.logger.error("Error parsing line in downloaded_links.jsonl: %s", e)
+                        continue
         except Exception as e:
-            self.logger.error(f"Error loading downloaded_links.jsonl: {e}")
-        return downloaded_links
+            self.logger.error("Error loading downloaded_links.jsonl: %s", e)
+        return _AccessionSet(downloaded_links)
 
     async def _save_downloaded_link(self, url: str, metadata: dict):
         """Save a downloaded link to JSONL file."""
-        est_ = pytz.timezone('US/Eastern')
-        timestamp_collection = datetime.now(timezone.utc).astimezone(est_).strftime("%Y-%m-%d_%H:%M:%S_%Z")
+        timestamp_collection = self._now_est()
         try:
             entry = {
-                '_id': str(uuid.uuid4()),
+                '_id': self._uuid_pool.next(),
                 'url': url,
                 'timestamp_collection': timestamp_collection,
                 'metadata': metadata
             }
-            async with aiofiles.open(self.downloaded_links_file, 'a') as f:
-                await f.write(json.dumps(entry) + '\n')
+            async with aiofiles.open(self.downloaded_links_file, 'ab') as f:
+                await f.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
             return entry
         except Exception as e:
-            self.logger.error(f"Error saving to downloaded_links.jsonl: {e}")
+            self.logger.error("Error saving to downloaded_links.jsonl: %s", e)
             return None
 
 def setup_logging():
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    est_ = pytz.timezone('US/Eastern')
-    timestamp_collection = datetime.now(timezone.utc).astimezone(est_).strftime("%Y-%m-%d_%H:%M:%S_%Z")
+    timestamp_collection = datetime.now(timezone.utc).astimezone(_EST).strftime("%Y-%m-%d_%H:%M:%S_%Z")
     
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_dir / f"sec_download_{timestamp_collection}.log"),
-            logging.StreamHandler()
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler(log_dir / f"sec_download_{timestamp_collection}.log"),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Log calls from the event loop only enqueue; a background thread does the I/O
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Final formatting happens in the listener
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
     return logging.getLogger(__name__)
 
 def setup_argparse():
@@ -1027,51 +1504,59 @@ async def main():
     parser = setup_argparse()
     args = parser.parse_args()
     
-    downloader = SECDownloader()
-    
-    years = range(args.start_year, args.end_year + 1)
-    quarters = range(1, 5)
+    async with SECDownloader() as downloader:
+        years = range(args.start_year, args.end_year + 1)
+        quarters = range(1, 5)
     
-    # Process year by year
-    for year in years:
-        # Load cache for this year only
-        downloader.downloaded_files_cache = {}  # Clear previous year's cache
-        jsonl_path = Path("output") / f"results-ex-10-{year}.jsonl"
-        if jsonl_path.exists():
-            try:
-                with open(jsonl_path, 'r') as f:
-                    for line in f:
+        # Process year by year
+        for year in years:
+            if downloader._shutdown.is_set():
+                logger.info("Shutdown requested, skipping remaining years")
+                break
+            # Load cache for this year only
+            downloader.downloaded_files_cache = {}  # Clear previous year's cache
+            jsonl_path = Path("output") / f"results-ex-10-{year}.jsonl"
+            if jsonl_path.exists():
+                year_cache = array('Q')  # Duplicates are dropped by _AccessionSet
+                try:
+                    for line in _iter_jsonl_lines(jsonl_path):
                         try:
-                            data = json.loads(line.strip())
+                            data = orjson.loads(line)
                             accession = data.get('accession_number', '')
                             if not accession and 'doc_info' in data:
                                 accession = data['doc_info'].get('accession_number', '')
-                            
+                        
                             submission_filename = data.get('submission_filename', '')
                             if not submission_filename and 'doc_info' in data:
                                 submission_filename = data['doc_info'].get('submission_filename', '')
-                            submission_filename = Path(submission_filename) if submission_filename else None
-                            
-                            if accession and submission_filename:
-                                if year not in downloader.downloaded_files_cache:
-                                    downloader.downloaded_files_cache[year] = set()
-                                entry = (accession.replace('-', ''), Path(submission_filename).name)
-                                downloader.downloaded_files_cache[year].add(entry)
-                        except json.JSONDecodeError:
-                            continue
-            except Exception as e:
-                logger.error(f"Error reading cache file {jsonl_path}: {str(e)}")
-                continue
+                        
+                            key = _accession_key(accession) if accession and submission_filename else None
+                            if key is not None:
+                                year_cache.append(key)
+                        except (orjson.JSONDecodeError, KeyError, OverflowError, ValueError, AttributeError):
+                            continue  # One bad line must not drop the whole year's cache
+                    # Compact and read-only so every worker shares the same set
+                    downloader.downloaded_files_cache[year] = _AccessionSet(year_cache)
+                except Exception as e:
+                    logger.error("Error reading cache file %s: %s", jsonl_path, e)
+                    continue
         
-        # Process all quarters for this year
-        try:
-            downloader.files_to_process = [f"master{q}{year}.idx" for q in quarters]
-            await downloader.process_submissions()
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {str(e)}")
+            # Process all quarters for this year
+            try:
+                downloader.files_to_process = [f"master{q}{year}.idx" for q in quarters]
+                await downloader.process_submissions()
+            except Exception as e:
+                logger.error("An unexpected error occurred: %s", e)
 
 if __name__ == "__main__":
     logger = setup_logging()
     logger.debug("Starting SEC EX-10 exhibit processor")
+    try:
+        # Optional: uvloop's libuv loop speeds up socket and executor callbacks
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.debug("Using uvloop event loop")
+    except ImportError:
+        pass
     asyncio.run(main())
     logger.debug("Processing complete")
\ No newline at end of file
@@ -0,0 +1,88 @@
+import importlib.util
+import logging
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "sample_filing.txt"
+SUBMISSION_FILENAME = "edgar/data/1821534/0001140361-21-038137.txt"
+
+# The script name has a hyphen, so it cannot be imported by name
+_spec = importlib.util.spec_from_file_location("sec_edgar_bulker", ROOT / "sec-edgar-bulker.py")
+bulker = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bulker)
+
+
+@pytest.fixture(scope="module")
+def raw_filing():
+    return FIXTURE.read_bytes()
+
+
+@pytest.fixture(scope="module")
+def documents(raw_filing):
+    _, spans = bulker._parse_filing_sync(raw_filing, SUBMISSION_FILENAME)
+    return [raw_filing[start:end] for start, end in spans]
+
+
+def test_header_fields(raw_filing):
+    header_info, _ = bulker._parse_filing_sync(raw_filing, SUBMISSION_FILENAME)
+
+    assert header_info['sec_document'] == '0001140361-21-038137.txt : 20211116'
+    assert header_info['sec_header'] == '0001140361-21-038137.hdr.sgml : 20211116'
+    assert header_info['acceptance_datetime'] == '20211116163252'
+    assert header_info['accession_number'] == '000114036121038137'
+    assert header_info['conformed_submission_type'] == '1-U'
+    assert header_info['submission_type'] == '1-U'
+    assert header_info['filing_form_type'] == '1-U'
+    assert header_info['period_of_report'] == '20211116'
+    assert header_info['filing_date'] == '20211116'
+    assert header_info['public_document_count'] == '5'
+    assert header_info['company_name'] == 'Exodus Movement, Inc.'
+    assert header_info['standard_industrial_classification'] == 'FINANCE SERVICES'
+    assert header_info['classification_number'] == '6199'
+    assert header_info['sec-header-complete'].startswith('<SEC-HEADER>')
+    assert header_info['sec-header-complete'].endswith('</SEC-HEADER>')
+
+
+def test_document_spans(raw_filing, documents):
+    assert len(documents) == 5
+    for doc in documents:
+        assert doc.startswith(b'<DOCUMENT>')
+    for doc in documents[:-1]:
+        assert doc.endswith(b'</DOCUMENT>')
+    # The last document has no </DOCUMENT>, so it runs to the end of the filing
+    assert raw_filing.endswith(documents[-1])
+
+
+def test_document_spans_without_documents():
+    assert bulker._document_spans(b'<SEC-HEADER>\n</SEC-HEADER>\n') == []
+
+
+def test_document_metadata(documents):
+    metadata = [bulker.SECDownloader._parse_documents(None, doc, {}) for doc in documents]
+
+    assert [m['document_type'] for m in metadata] == [
+        '1-U', 'EX-10.1', 'EX-99.1', 'MATERIAL CONTRACT', 'GRAPHIC'
+    ]
+    assert [m['sequence'] for m in metadata] == ['1', '2', '3', '4', '5']
+    assert metadata[1]['document_filename'] == 'brhc10030255_ex10-1.htm'
+    assert metadata[1]['description'] == 'EXHIBIT 10.1'
+    # No <TITLE> tag before <TEXT>, so the HTML <title> in the body is used
+    assert metadata[1]['title'] == 'Material contract'
+    assert metadata[4]['description'] == ''
+
+
+@pytest.mark.parametrize("doc_type, filename, expected", [
+    ('1-U', 'brhc10030255_1u.htm', False),
+    ('EX-10.1', 'brhc10030255_ex10-1.htm', True),
+    ('EX-99.1', 'brhc10030255_ex99-1.htm', False),
+    ('MATERIAL CONTRACT', 'brhc10030255_ex10-2.htm', True),
+    ('GRAPHIC', 'logo.jpg', False),
+])
+def test_ex10_verdicts(doc_type, filename, expected):
+    downloader = SimpleNamespace(logger=logging.getLogger(__name__), stats=Counter())
+    assert bulker.SECDownloader._apply_document_rules(downloader, doc_type, filename) is expected
+    assert downloader.stats['ex10_matches'] == int(expected)